@@ -17,10 +17,28 @@ In search.py, you will implement generic search algorithms which are called by
 Pacman agents (in searchAgents.py).
 """
 
+from array import array
+from collections import deque
+
+# np/njit are None when numpy/numba are not installed, in which case every
+# search falls back to the pure-Python implementations below. The compiled
+# kernels live in searchKernels.py so this module stays mypyc-compilable
+# (see setup.py).
+from searchKernels import np, njit, _astarGridKernel
+
 import util
 from game import Directions
-from typing import List
+from typing import Any, Dict, List
+
+# No-op unless this module is compiled with mypyc; searchAgents' interpreted
+# problem classes must be allowed to subclass a compiled SearchProblem.
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:
+    def mypyc_attr(*attrs, **kwattrs):  # type: ignore[misc]
+        return lambda cls: cls
 
+@mypyc_attr(allow_interpreted_subclasses=True)
 class SearchProblem:
     """
     This class outlines the structure of a search problem, but doesn't implement
@@ -71,10 +89,289 @@ def tinyMazeSearch(problem: SearchProblem) -> List[Directions]:
     Returns a sequence of moves that solves tinyMaze.  For any other maze, the
     sequence of moves will be incorrect, so only use this for tinyMaze.
     """
-    s = Directions.SOUTH
-    w = Directions.WEST
+    s: Any = Directions.SOUTH
+    w: Any = Directions.WEST
     return  [s, s, w, s, w, w, s, w]
 
+def _reconstructPath(parentOf, actionOf, decode, idx) -> List[Directions]:
+    """
+    Walk parent indices backward through the parallel 'parentOf'/'actionOf'
+    node arrays (the start node has parent -1) and return the sequence of
+    actions from the start state to the node at 'idx', mapping stored int
+    action codes back through the 'decode' table.
+    """
+    path = []
+    while parentOf[idx] != -1:
+        path.append(decode[actionOf[idx]])
+        idx = parentOf[idx]
+    path.reverse()
+    return path
+
+def _encodeAction(action, actionCodes, decode):
+    """
+    Intern 'action' into the per-search int code table, returning its code.
+    Actions are kept as int16 codes in the node arrays and only decoded back
+    (via 'decode') when the final path is reconstructed.
+    """
+    code = actionCodes.get(action)
+    if code is None:
+        code = len(decode)
+        actionCodes[action] = code
+        decode.append(action)
+    return code
+
+def _genericSearch(problem: SearchProblem, push=None, pop=None, isEmpty=None,
+                   priorityFn=None, preferHigherG=False) -> List[Directions]:
+    """
+    Graph-search driver shared by DFS/BFS/UCS/A*, so the hot loop (and every
+    optimization applied to it) lives in exactly one place.
+
+    Node bookkeeping is struct-of-arrays: parallel stateOf/parentOf/actionOf
+    (plus costOf for cost-ordered searches) lists indexed by node id, so a
+    frontier entry is a single int instead of a freshly allocated tuple.
+
+    For uninformed searches, pass 'push'/'pop'/'isEmpty' callables of the
+    frontier container (stack for DFS, queue for BFS); visited states are
+    never re-expanded.
+
+    For cost-ordered searches, pass 'priorityFn(state, cost)' instead; the
+    driver manages its own heapq frontier with lazy deletion (stale entries,
+    superseded by a cheaper path pushed later, are discarded at pop time by
+    the visited-cost check), and a counter keeps tuple comparison away from
+    states while preserving FIFO order among equal-priority entries.
+    'preferHigherG' breaks priority ties toward deeper nodes (higher path
+    cost), which drives A* depth-first across equal-f plateaus and avoids
+    re-expanding shallow nodes.
+    """
+    startState = problem.getStartState()
+    stateOf = [startState]
+    parentOf = array('q', [-1])
+    actionOf = array('h', [-1])
+    actionCodes: Dict[Any, int] = {}
+    decode: List[Any] = []
+
+    # Bind hot-loop lookups once: LOAD_FAST on a local is cheaper than a
+    # LOAD_ATTR per iteration, which adds up over 10^5+ expansions.
+    isGoal = problem.isGoalState
+    getSuccessors = problem.getSuccessors
+    appendState = stateOf.append
+    appendParent = parentOf.append
+    appendAction = actionOf.append
+
+    # Grid fast path for the visited structure: when states are (x, y) int
+    # tuples on a bounded maze (the problem exposes a walls grid), membership
+    # can live in a flat bytearray / cost array indexed by x*height + y
+    # instead of a hash container keyed by tuples.
+    walls: Any = getattr(problem, 'walls', None)
+    onGrid = (walls is not None and type(startState) is tuple
+              and len(startState) == 2
+              and type(startState[0]) is int and type(startState[1]) is int)
+
+    if priorityFn is None:
+        if onGrid:
+            visited = bytearray(walls.width * walls.height)
+            height = walls.height
+            def wasVisited(state):
+                return visited[state[0] * height + state[1]]
+            def markVisited(state):
+                visited[state[0] * height + state[1]] = 1
+        else:
+            visitedSet = set()
+            def wasVisited(state):
+                return state in visitedSet
+            def markVisited(state):
+                visitedSet.add(state)
+
+        push(0)
+
+        while not isEmpty():
+            currentIdx = pop()
+            currentState = stateOf[currentIdx]
+
+            if isGoal(currentState):
+                return _reconstructPath(parentOf, actionOf, decode, currentIdx)
+
+            if not wasVisited(currentState):
+                markVisited(currentState)
+
+                for nextState, action, _ in getSuccessors(currentState):
+                    # Skip successors already expanded: their pops would be
+                    # discarded anyway, so this only shrinks the frontier
+                    # (the expansion order is unchanged).
+                    if not wasVisited(nextState):
+                        appendState(nextState)
+                        appendParent(currentIdx)
+                        appendAction(_encodeAction(action, actionCodes, decode))
+                        push(len(stateOf) - 1)
+
+        return []
+
+    inf = float('inf')
+    if onGrid:
+        costs = array('d', [inf]) * (walls.width * walls.height)
+        height = walls.height
+        def bestCost(state):
+            return costs[state[0] * height + state[1]]
+        def setBestCost(state, cost):
+            costs[state[0] * height + state[1]] = cost
+    else:
+        bestCosts: Dict[Any, float] = {}
+        def bestCost(state):
+            return bestCosts.get(state, inf)
+        def setBestCost(state, cost):
+            bestCosts[state] = cost
+
+    # BucketQueue serves integer priorities (unit/integer step costs) from
+    # per-priority FIFO buckets in O(1); it silently becomes a plain binary
+    # heap on the first non-integer priority, with identical pop order
+    # (priority, then push order) either way.
+    frontier = util.BucketQueue()
+    costOf = [0]
+    appendCost = costOf.append
+    push = frontier.push
+    pop = frontier.pop
+    isEmpty = frontier.isEmpty
+    push(0, priorityFn(startState, 0))
+
+    while not isEmpty():
+        currentIdx = pop()
+        currentState = stateOf[currentIdx]
+        currentCost = costOf[currentIdx]
+
+        if isGoal(currentState):
+            return _reconstructPath(parentOf, actionOf, decode, currentIdx)
+
+        if currentCost < bestCost(currentState):
+            setBestCost(currentState, currentCost)
+
+            for nextState, action, cost in getSuccessors(currentState):
+                newCost = currentCost + cost
+                if newCost < bestCost(nextState):
+                    appendState(nextState)
+                    appendParent(currentIdx)
+                    appendAction(_encodeAction(action, actionCodes, decode))
+                    appendCost(newCost)
+                    push(len(stateOf) - 1, priorityFn(nextState, newCost),
+                         -newCost if preferHigherG else 0)
+
+    return []
+
+def _bfsGrid(problem) -> List[Directions]:
+    """
+    BFS over a walls grid as a vectorized numpy wavefront: grow
+    distance-to-goal layers by shifting the frontier mask one cell N/S/E/W
+    per pass, then walk forward from the start, at each step taking the
+    first direction (in N, S, E, W order) that moves one layer closer.
+
+    FIFO BFS with that successor order returns the lexicographically
+    smallest shortest action sequence, and so does this walk, so the result
+    matches the pure-Python driver without any per-cell Python work.
+
+    The wavefront never calls getSuccessors, so the node counter and
+    explored-cells overlay are replayed here from the cells the wave
+    touched. Because the wave grows from the goal rather than the start,
+    the count and overlay track the pure driver's closely but are not
+    identical to them.
+    """
+    walls = np.array(problem.walls.data, dtype=np.bool_)
+    sx, sy = problem.getStartState()
+    gx, gy = problem.goal
+    open_ = ~walls
+
+    # Distance to goal; the wave expands from the goal so reconstruction can
+    # run forward from the start.
+    dist = np.full(walls.shape, -1, dtype=np.int32)
+    frontier = np.zeros(walls.shape, dtype=np.bool_)
+    touched: List[Any] = []
+    if not walls[gx, gy]:
+        frontier[gx, gy] = True
+        dist[gx, gy] = 0
+        touched.append((gx, gy))
+    d = 0
+    while frontier.any() and dist[sx, sy] == -1:
+        d += 1
+        nxt = np.zeros_like(frontier)
+        nxt[1:, :] |= frontier[:-1, :]
+        nxt[:-1, :] |= frontier[1:, :]
+        nxt[:, 1:] |= frontier[:, :-1]
+        nxt[:, :-1] |= frontier[:, 1:]
+        nxt &= open_ & (dist == -1)
+        dist[nxt] = d
+        frontier = nxt
+        touched.extend((int(cx), int(cy)) for cx, cy in np.argwhere(nxt))
+
+    _replayBookkeeping(problem, touched)
+    if dist[sx, sy] == -1:
+        return []
+
+    width, height = walls.shape
+    moves = ((Directions.NORTH, 0, 1), (Directions.SOUTH, 0, -1),
+             (Directions.EAST, 1, 0), (Directions.WEST, -1, 0))
+    x, y = sx, sy
+    path: List[Any] = []
+    while (x, y) != (gx, gy):
+        for action, dx, dy in moves:
+            nx, ny = x + dx, y + dy
+            if (0 <= nx < width and 0 <= ny < height
+                    and dist[nx, ny] == dist[x, y] - 1):
+                path.append(action)
+                x, y = nx, ny
+                break
+    # The pure driver's last act is goal-testing the goal state it popped,
+    # which is what triggers the explored-cells overlay draw.
+    problem.isGoalState((gx, gy))
+    return path
+
+def _replayBookkeeping(problem, states) -> None:
+    """
+    Re-create the per-expansion side effects of getSuccessors — the node
+    counter and the visited list behind the explored-cells overlay — for
+    fast paths that never call it.
+    """
+    if hasattr(problem, '_expanded'):
+        problem._expanded += len(states)
+    visited = getattr(problem, '_visited', None)
+    visitedlist = getattr(problem, '_visitedlist', None)
+    if visited is not None and visitedlist is not None:
+        for state in states:
+            if state not in visited:
+                visited[state] = True
+                visitedlist.append(state)
+
+# Heuristics cheap enough to precompute for every open cell before handing
+# the search to the compiled kernel.
+_CHEAP_HEURISTICS = ('nullHeuristic', 'manhattanHeuristic', 'euclideanHeuristic')
+
+def _astarGrid(problem, heuristic) -> List[Directions]:
+    """
+    Tabulate per-cell heuristic and step-cost values, run the numba A*
+    kernel, and decode its int8 direction codes back into Directions. The
+    kernel reports the cells it expanded in expansion order, so the node
+    counter and explored-cells overlay match the pure driver exactly.
+    """
+    walls = problem.walls
+    width, height = walls.width, walls.height
+    wallsArr = np.array(walls.data, dtype=np.bool_)
+    hvals = np.zeros((width, height))
+    cvals = np.ones((width, height))
+    for x in range(width):
+        for y in range(height):
+            if not walls[x][y]:
+                hvals[x, y] = heuristic((x, y), problem)
+                cvals[x, y] = problem.costFn((x, y))
+    sx, sy = problem.getStartState()
+    gx, gy = problem.goal
+    codes, expandedCells = _astarGridKernel(wallsArr, hvals, cvals, sx, sy, gx, gy)
+    _replayBookkeeping(problem, [(int(c) // height, int(c) % height)
+                                 for c in expandedCells])
+    decode = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+    path = [decode[c] for c in codes]
+    if path or (sx, sy) == (gx, gy):
+        # As in _bfsGrid: the goal-state test the driver ends on is what
+        # triggers the explored-cells overlay draw.
+        problem.isGoalState((gx, gy))
+    return path
+
 def depthFirstSearch(problem: SearchProblem) -> List[Directions]:
     """
     Search the deepest nodes in the search tree first.
@@ -90,68 +387,182 @@ def depthFirstSearch(problem: SearchProblem) -> List[Directions]:
     print("Start's successors:", problem.getSuccessors(problem.getStartState()))
     """
 
-    
     frontier = util.Stack()
-    frontier.push((problem.getStartState(), []))
-    visited = set()
-
-    while not frontier.isEmpty():
-        currentState, path = frontier.pop()
-        
-        if problem.isGoalState(currentState):
-            return path
-            
-        if currentState not in visited:
-            visited.add(currentState)
-            
+    return _genericSearch(problem, frontier.push, frontier.pop, frontier.isEmpty)
+
+def iterativeDeepeningSearch(problem: SearchProblem) -> List[Directions]:
+    """
+    Depth-first search with an iteratively doubled depth limit (IDDFS).
+
+    Plain DFS can push an unbounded number of frontier entries before the
+    visited check prunes them; bounding the depth keeps the live frontier
+    small (and cache-resident) at the cost of re-exploring shallow levels
+    each round. Within a round, a state is revisited only when reached at a
+    strictly shallower depth, so deeper paths cannot mask a goal below the
+    limit. Note the autograded agents keep depthFirstSearch's classic stack
+    semantics; this is available as 'ids'.
+
+    Doubling the limit (rather than incrementing it) means the paths
+    returned are legal but not guaranteed shortest: DFS is free to wander
+    within the final round's slack (e.g. 102 steps on mediumMaze where
+    breadthFirstSearch finds 68). Classic unit-increment IDDFS recovers
+    optimality at the cost of one re-exploration round per depth level.
+
+    Unlike the weighted searches, an uninformed search may goal-test at
+    generation time instead of pop time without losing correctness, so a
+    goal found while expanding returns immediately rather than waiting for
+    its turn on the stack. (depthFirstSearch/breadthFirstSearch keep the
+    pop-time test: the autograder's gold traces pin when each state is
+    expanded, and with it the exact path DFS wanders to.)
+    """
+    limit = 1
+    startState = problem.getStartState()
+    if problem.isGoalState(startState):
+        return []
+    while True:
+        stateOf = [startState]
+        parentOf = array('q', [-1])
+        actionOf = array('h', [-1])
+        actionCodes: Dict[Any, int] = {}
+        decode: List[Any] = []
+        frontier = [(0, 0)]
+        seenDepth = {startState: 0}
+        cutoff = False
+
+        while frontier:
+            currentIdx, depth = frontier.pop()
+            currentState = stateOf[currentIdx]
+
+            if depth == limit:
+                cutoff = True
+                continue
+
             for nextState, action, _ in problem.getSuccessors(currentState):
-                frontier.push((nextState, path + [action]))
-    
+                prevDepth = seenDepth.get(nextState)
+                if prevDepth is None or depth + 1 < prevDepth:
+                    seenDepth[nextState] = depth + 1
+                    stateOf.append(nextState)
+                    parentOf.append(currentIdx)
+                    actionOf.append(_encodeAction(action, actionCodes, decode))
+                    if problem.isGoalState(nextState):
+                        return _reconstructPath(parentOf, actionOf, decode, len(stateOf) - 1)
+                    frontier.append((len(stateOf) - 1, depth + 1))
+
+        if not cutoff:
+            return []
+        limit *= 2
+
+def bidirectionalSearch(problem: SearchProblem) -> List[Directions]:
+    """
+    Bidirectional BFS for unweighted problems with an explicit goal state:
+    expand layers alternately from the start (forward) and the goal
+    (backward), always growing the smaller frontier, and splice the two
+    half-paths when the waves meet — touching O(2·b^(d/2)) states instead
+    of O(b^d).
+
+    Backward expansion uses problem.getPredecessors when the problem
+    provides it; otherwise predecessors are derived from getSuccessors with
+    reversed actions, which is valid on symmetric transition graphs such as
+    Pacman position mazes. Available as 'bibfs'; breadthFirstSearch keeps
+    the classic single-direction semantics the autograder expects.
+    """
+    start = problem.getStartState()
+    goal = getattr(problem, 'goal')
+    if start == goal:
+        return []
+
+    getSuccessors = problem.getSuccessors
+    getPredecessors = getattr(problem, 'getPredecessors', None)
+    if getPredecessors is None:
+        reverse = Directions.REVERSE
+        def getPredecessors(state):
+            return [(nextState, reverse[action])
+                    for nextState, action, _ in getSuccessors(state)]
+
+    # Each side maps state -> (neighbor toward its root, action); depths let
+    # the layer sweep pick the meeting point with the smallest total length.
+    fwdParent: Dict[Any, Any] = {start: None}
+    bwdNext: Dict[Any, Any] = {goal: None}
+    fwdDepth = {start: 0}
+    bwdDepth = {goal: 0}
+    fwdFrontier = [start]
+    bwdFrontier = [goal]
+
+    def splice(meet):
+        path = []
+        state = meet
+        while fwdParent[state] is not None:
+            prevState, action = fwdParent[state]
+            path.append(action)
+            state = prevState
+        path.reverse()
+        state = meet
+        while bwdNext[state] is not None:
+            nextState, action = bwdNext[state]
+            path.append(action)
+            state = nextState
+        return path
+
+    while fwdFrontier and bwdFrontier:
+        meetings = []
+        if len(fwdFrontier) <= len(bwdFrontier):
+            depth = fwdDepth[fwdFrontier[0]] + 1
+            nextLayer = []
+            for state in fwdFrontier:
+                for nextState, action, _ in getSuccessors(state):
+                    if nextState not in fwdParent:
+                        fwdParent[nextState] = (state, action)
+                        fwdDepth[nextState] = depth
+                        if nextState in bwdDepth:
+                            meetings.append(nextState)
+                        else:
+                            nextLayer.append(nextState)
+            fwdFrontier = nextLayer
+        else:
+            depth = bwdDepth[bwdFrontier[0]] + 1
+            nextLayer = []
+            for state in bwdFrontier:
+                for prevState, action in getPredecessors(state):
+                    if prevState not in bwdNext:
+                        bwdNext[prevState] = (state, action)
+                        bwdDepth[prevState] = depth
+                        if prevState in fwdDepth:
+                            meetings.append(prevState)
+                        else:
+                            nextLayer.append(prevState)
+            bwdFrontier = nextLayer
+
+        if meetings:
+            best = min(meetings, key=lambda s: fwdDepth[s] + bwdDepth[s])
+            return splice(best)
+
     return []
 
 def breadthFirstSearch(problem: SearchProblem) -> List[Directions]:
     """Search the shallowest nodes in the search tree first."""
 
-    frontier = util.Queue()
-    frontier.push((problem.getStartState(), []))
-    visited = set()
-
-    while not frontier.isEmpty():
-        currentState, path = frontier.pop()
-        
-        if problem.isGoalState(currentState):
-            return path
-            
-        if currentState not in visited:
-            visited.add(currentState)
-            
-            for nextState, action, _ in problem.getSuccessors(currentState):
-                frontier.push((nextState, path + [action]))
-    
-    return []
+    # Grid position problems (explicit (x, y) goal) run as a numpy wavefront
+    # when numpy is installed; see _bfsGrid.
+    if np is not None:
+        goal = getattr(problem, 'goal', None)
+        start = problem.getStartState()
+        if (getattr(problem, 'walls', None) is not None
+                and type(goal) is tuple and len(goal) == 2
+                and type(start) is tuple and len(start) == 2
+                and type(start[0]) is int and type(start[1]) is int):
+            return _bfsGrid(problem)
+
+    # collections.deque instead of util.Queue: util.Queue enqueues with
+    # list.insert(0, x), which shifts the whole backing list and makes each
+    # push O(frontier size); deque's append/popleft are O(1) in C.
+    frontier: deque = deque()
+    return _genericSearch(problem, frontier.append, frontier.popleft,
+                          lambda: not frontier)
 
 def uniformCostSearch(problem: SearchProblem) -> List[Directions]:
     """Search the node of least total cost first."""
 
-    frontier = util.PriorityQueue()
-    frontier.push((problem.getStartState(), [], 0), 0)
-    visited = {}
-    
-    while not frontier.isEmpty():
-        currentState, path, currentCost = frontier.pop()
-        
-        if problem.isGoalState(currentState):
-            return path
-            
-        if currentState not in visited or currentCost < visited[currentState]:
-            visited[currentState] = currentCost
-            
-            for nextState, action, cost in problem.getSuccessors(currentState):
-                newCost = currentCost + cost
-                if nextState not in visited or newCost < visited[nextState]:
-                    frontier.push((nextState, path + [action], newCost), newCost)
-    
-    return []
+    return _genericSearch(problem, priorityFn=lambda state, cost: cost)
 
 def nullHeuristic(state, problem=None) -> float:
     """
@@ -163,30 +574,38 @@ def nullHeuristic(state, problem=None) -> float:
 def aStarSearch(problem: SearchProblem, heuristic=nullHeuristic) -> List[Directions]:
     """Search the node that has the lowest combined cost and heuristic first."""
 
-    frontier = util.PriorityQueue()
-    startState = problem.getStartState()
-    frontier.push((startState, [], 0), 0 + heuristic(startState, problem))
-    visited = {}
-    
-    while not frontier.isEmpty():
-        currentState, path, currentCost = frontier.pop()
-        
-        if problem.isGoalState(currentState):
-            return path
-            
-        if currentState not in visited or currentCost < visited[currentState]:
-            visited[currentState] = currentCost
-            
-            for nextState, action, cost in problem.getSuccessors(currentState):
-                newCost = currentCost + cost
-                priority = newCost + heuristic(nextState, problem)
-                if nextState not in visited or newCost < visited[nextState]:
-                    frontier.push((nextState, path + [action], newCost), priority)
-    
-    return []
+    # Grid position problems with a cheap, state-only heuristic run in the
+    # numba-compiled kernel when numba is installed; everything else (and
+    # every setup without numba) uses the pure-Python driver below.
+    if njit is not None:
+        goal = getattr(problem, 'goal', None)
+        start = problem.getStartState()
+        if (getattr(problem, 'walls', None) is not None
+                and hasattr(problem, 'costFn')
+                and type(goal) is tuple and len(goal) == 2
+                and type(start) is tuple and len(start) == 2
+                and type(start[0]) is int and type(start[1]) is int
+                and getattr(heuristic, '__name__', '') in _CHEAP_HEURISTICS):
+            return _astarGrid(problem, heuristic)
+
+    # The same state is generated from several parents before it is popped;
+    # cache heuristic values per state so each distinct state is evaluated
+    # once, which matters for expensive heuristics like maze distance.
+    hcache: Dict[Any, float] = {}
+    def h(state):
+        value = hcache.get(state)
+        if value is None:
+            value = heuristic(state, problem)
+            hcache[state] = value
+        return value
+
+    return _genericSearch(problem, priorityFn=lambda state, cost: cost + h(state),
+                          preferHigherG=True)
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
+ids = iterativeDeepeningSearch
+bibfs = bidirectionalSearch
 astar = aStarSearch
 ucs = uniformCostSearch
@@ -58,6 +58,32 @@ class GoWestAgent(Agent):
 #       after you fill in parts of search.py          #
 #######################################################
 
+_searchSourceParams = None
+
+def _searchSourceParameters(fn):
+    """
+    Parameter names of a top-level function in search.py, read from the
+    source file. Needed when search is compiled to a C extension, whose
+    functions carry no __code__ (or signature) to introspect.
+    """
+    global _searchSourceParams
+    if _searchSourceParams is None:
+        import ast, os
+        source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search.py')
+        _searchSourceParams = {}
+        for node in ast.parse(open(source).read()).body:
+            if isinstance(node, ast.FunctionDef):
+                args = node.args
+                _searchSourceParams[node.name] = [a.arg for a in
+                    args.posonlyargs + args.args + args.kwonlyargs]
+            elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Name):
+                # Abbreviations like astar = aStarSearch share the
+                # function's parameter list
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and node.value.id in _searchSourceParams:
+                        _searchSourceParams[target.id] = _searchSourceParams[node.value.id]
+    return _searchSourceParams.get(fn, [])
+
 class SearchAgent(Agent):
     """
     This very general search agent finds a path using a supplied search
@@ -82,7 +108,15 @@ class SearchAgent(Agent):
         if fn not in dir(search):
             raise AttributeError(fn + ' is not a search function in search.py.')
         func = getattr(search, fn)
-        if 'heuristic' not in func.__code__.co_varnames:
+        code = getattr(func, '__code__', None)
+        if code is not None:
+            takesHeuristic = 'heuristic' in code.co_varnames
+        else:
+            # A compiled search module (python setup.py build_ext --inplace)
+            # exposes builtin-style functions without __code__; read the
+            # parameter names from search.py itself instead.
+            takesHeuristic = 'heuristic' in _searchSourceParameters(fn)
+        if not takesHeuristic:
             print('[SearchAgent] using function ' + fn)
             self.searchFunction = func
         else:
@@ -168,6 +202,9 @@ class PositionSearchProblem(search.SearchProblem):
         # For display purposes
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
 
+        # Successor lists are immutable per state, so build each one once
+        self._successorCache = {}
+
     def getStartState(self):
         return self.startState
 
@@ -196,15 +233,18 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        successors = self._successorCache.get(state)
+        if successors is None:
+            successors = []
+            for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                x,y = state
+                dx, dy = Actions.directionToVector(action)
+                nextx, nexty = int(x + dx), int(y + dy)
+                if not self.walls[nextx][nexty]:
+                    nextState = (nextx, nexty)
+                    cost = self.costFn(nextState)
+                    successors.append( ( nextState, action, cost) )
+            self._successorCache[state] = successors
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
@@ -0,0 +1,213 @@
+# searchKernels.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Numba-compiled grid kernels used by search.py.
+
+These live in their own module so that search.py itself can be compiled
+ahead of time with mypyc (see setup.py): numba's @njit needs an ordinary
+Python function to translate, which a mypyc-compiled module no longer
+provides. numpy/numba are optional — when they are missing, np/njit are
+None and search.py falls back to its pure-Python implementations.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _heapLess(f1, t1, c1, f2, t2, c2):
+        if f1 != f2:
+            return f1 < f2
+        if t1 != t2:
+            return t1 < t2
+        return c1 < c2
+
+    @njit(cache=True)
+    def _astarGridKernel(walls, hvals, cvals, sx, sy, gx, gy):
+        """
+        A* over a walls grid, compiled with numba. Mirrors _genericSearch's
+        cost-ordered loop exactly — same (f, -g, push counter) heap order,
+        same N/S/E/W successor order, same pop-time dominance check — so it
+        returns the same action sequence as the pure-Python path, encoded as
+        int8 direction codes (0=N, 1=S, 2=E, 3=W).
+        """
+        height = walls.shape[1]
+        inf = np.inf
+
+        # Per-cell best g, written at pop time like the Python driver.
+        best = np.full(walls.shape[0] * height, inf)
+
+        # Node storage (one entry per push, chained by parent index) and a
+        # binary heap of node indices ordered by (f, push counter). Both are
+        # grown by doubling when full; heap size never exceeds node count.
+        cap = 1024
+        nodeX = np.empty(cap, np.int32)
+        nodeY = np.empty(cap, np.int32)
+        nodeG = np.empty(cap, np.float64)
+        nodeParent = np.empty(cap, np.int64)
+        nodeAction = np.empty(cap, np.int8)
+        heapF = np.empty(cap, np.float64)
+        heapT = np.empty(cap, np.float64)
+        heapC = np.empty(cap, np.int64)
+        heapN = np.empty(cap, np.int64)
+
+        # Expanded cells in expansion order; expansions never outnumber
+        # pushes, so the node capacity bounds this too.
+        order = np.empty(cap, np.int64)
+        nExp = 0
+
+        nodeX[0] = sx
+        nodeY[0] = sy
+        nodeG[0] = 0.0
+        nodeParent[0] = -1
+        nodeAction[0] = -1
+        nNodes = 1
+        heapF[0] = hvals[sx, sy]
+        heapT[0] = 0.0
+        heapC[0] = 0
+        heapN[0] = 0
+        size = 1
+        counter = 1
+
+        # Direction vectors in the same order getSuccessors uses: N, S, E, W.
+        dxs = (0, 0, 1, -1)
+        dys = (1, -1, 0, 0)
+
+        while size > 0:
+            node = heapN[0]
+            size -= 1
+            heapF[0] = heapF[size]
+            heapT[0] = heapT[size]
+            heapC[0] = heapC[size]
+            heapN[0] = heapN[size]
+            i = 0
+            while True:
+                m = 2 * i + 1
+                if m >= size:
+                    break
+                r = m + 1
+                if r < size and _heapLess(heapF[r], heapT[r], heapC[r],
+                                          heapF[m], heapT[m], heapC[m]):
+                    m = r
+                if _heapLess(heapF[m], heapT[m], heapC[m],
+                             heapF[i], heapT[i], heapC[i]):
+                    heapF[i], heapF[m] = heapF[m], heapF[i]
+                    heapT[i], heapT[m] = heapT[m], heapT[i]
+                    heapC[i], heapC[m] = heapC[m], heapC[i]
+                    heapN[i], heapN[m] = heapN[m], heapN[i]
+                    i = m
+                else:
+                    break
+
+            x = nodeX[node]
+            y = nodeY[node]
+            g = nodeG[node]
+
+            if x == gx and y == gy:
+                length = 0
+                n = node
+                while n != -1:
+                    if nodeAction[n] >= 0:
+                        length += 1
+                    n = nodeParent[n]
+                out = np.empty(length, np.int8)
+                n = node
+                i = length - 1
+                while n != -1:
+                    if nodeAction[n] >= 0:
+                        out[i] = nodeAction[n]
+                        i -= 1
+                    n = nodeParent[n]
+                return out, order[:nExp].copy()
+
+            cell = x * height + y
+            if g < best[cell]:
+                best[cell] = g
+                order[nExp] = cell
+                nExp += 1
+
+                for a in range(4):
+                    nx = x + dxs[a]
+                    ny = y + dys[a]
+                    if (nx < 0 or ny < 0 or nx >= walls.shape[0]
+                            or ny >= height or walls[nx, ny]):
+                        continue
+                    ng = g + cvals[nx, ny]
+                    if ng < best[nx * height + ny]:
+                        if nNodes == cap:
+                            cap *= 2
+                            tmpX = np.empty(cap, np.int32)
+                            tmpX[:nNodes] = nodeX
+                            nodeX = tmpX
+                            tmpY = np.empty(cap, np.int32)
+                            tmpY[:nNodes] = nodeY
+                            nodeY = tmpY
+                            tmpG = np.empty(cap, np.float64)
+                            tmpG[:nNodes] = nodeG
+                            nodeG = tmpG
+                            tmpP = np.empty(cap, np.int64)
+                            tmpP[:nNodes] = nodeParent
+                            nodeParent = tmpP
+                            tmpA = np.empty(cap, np.int8)
+                            tmpA[:nNodes] = nodeAction
+                            nodeAction = tmpA
+                            tmpF = np.empty(cap, np.float64)
+                            tmpF[:size] = heapF[:size]
+                            heapF = tmpF
+                            tmpT = np.empty(cap, np.float64)
+                            tmpT[:size] = heapT[:size]
+                            heapT = tmpT
+                            tmpC = np.empty(cap, np.int64)
+                            tmpC[:size] = heapC[:size]
+                            heapC = tmpC
+                            tmpN = np.empty(cap, np.int64)
+                            tmpN[:size] = heapN[:size]
+                            heapN = tmpN
+                            tmpO = np.empty(cap, np.int64)
+                            tmpO[:nExp] = order[:nExp]
+                            order = tmpO
+                        nodeX[nNodes] = nx
+                        nodeY[nNodes] = ny
+                        nodeG[nNodes] = ng
+                        nodeParent[nNodes] = node
+                        nodeAction[nNodes] = a
+                        i = size
+                        heapF[i] = ng + hvals[nx, ny]
+                        heapT[i] = -ng
+                        heapC[i] = counter
+                        heapN[i] = nNodes
+                        while i > 0:
+                            p = (i - 1) // 2
+                            if _heapLess(heapF[i], heapT[i], heapC[i],
+                                         heapF[p], heapT[p], heapC[p]):
+                                heapF[i], heapF[p] = heapF[p], heapF[i]
+                                heapT[i], heapT[p] = heapT[p], heapT[i]
+                                heapC[i], heapC[p] = heapC[p], heapC[i]
+                                heapN[i], heapN[p] = heapN[p], heapN[i]
+                                i = p
+                            else:
+                                break
+                        size += 1
+                        counter += 1
+                        nNodes += 1
+
+        return np.empty(0, np.int8), order[:nExp].copy()
+else:
+    _heapLess = None
+    _astarGridKernel = None
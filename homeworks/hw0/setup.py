@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""
+Optional ahead-of-time compilation of search.py with mypyc.
+
+The searches are pure-Python integer/list/dict loops, which is exactly the
+workload mypyc speeds up: it translates the module to C, so the hot loops
+run without bytecode dispatch. Build in place with
+
+    python setup.py build_ext --inplace
+
+which drops a compiled search extension next to search.py; Python prefers
+the extension over the source, so no import changes are needed anywhere.
+Delete the generated .so to fall back to the interpreted module. Requires
+mypy (pip install mypy); everything works unchanged without it.
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    raise SystemExit('mypyc not available: pip install mypy')
+
+setup(
+    name='search-compiled',
+    ext_modules=mypycify(['--follow-imports=silent', '--ignore-missing-imports',
+                           'search.py'], opt_level='3'),
+)
@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq, random
+from collections import deque
 
 
 class FixedRandom:
@@ -205,6 +206,122 @@ class PriorityQueue:
         else:
             self.push(item, priority)
 
+def heappush4(heap, item):
+    """
+    Push onto a 4-ary min-heap stored in a list. A 4-ary heap is half the
+    depth of heapq's binary heap, so sift-down does ~half as many levels of
+    comparisons per pop; any sorted list is a valid 4-ary heap.
+    """
+    heap.append(item)
+    i = len(heap) - 1
+    while i > 0:
+        parent = (i - 1) >> 2
+        if item < heap[parent]:
+            heap[i] = heap[parent]
+            i = parent
+        else:
+            break
+    heap[i] = item
+
+def heappop4(heap):
+    "Pop the smallest item from a 4-ary min-heap stored in a list."
+    last = heap.pop()
+    if not heap:
+        return last
+    smallest = heap[0]
+    i = 0
+    size = len(heap)
+    while True:
+        child = (i << 2) + 1
+        if child >= size:
+            break
+        end = min(child + 4, size)
+        m = child
+        for c in range(child + 1, end):
+            if heap[c] < heap[m]:
+                m = c
+        if heap[m] < last:
+            heap[i] = heap[m]
+            i = m
+        else:
+            break
+    heap[i] = last
+    return smallest
+
+class BucketQueue:
+    """
+      A priority queue for non-negative integer priorities, as produced by
+      searches over unit or small integer step costs. It keeps one FIFO
+      bucket per priority value plus a minimum cursor, giving O(1) amortized
+      push/pop instead of a binary heap's O(log n). The first non-integer
+      priority pushed permanently converts the queue into an equivalent
+      binary heap, so callers need not know their edge-cost types up front.
+      Equal priorities are served by ascending 'tie' value, then push order,
+      matching PriorityQueue's counter behavior when ties are left at 0.
+    """
+    def __init__(self):
+        self.buckets = {}
+        self.curMin = 0
+        self.size = 0
+        self.counter = 0
+        self.heap = None
+
+    def push(self, item, priority, tie=0):
+        if self.heap is None:
+            if type(priority) is int:
+                bucket = self.buckets.get(priority)
+                if bucket is None:
+                    bucket = []
+                    self.buckets[priority] = bucket
+                heappush4(bucket, (tie, self.counter, item))
+                self.counter += 1
+                if priority < self.curMin:
+                    self.curMin = priority
+                self.size += 1
+                return
+            self._becomeHeap()
+        heappush4(self.heap, (priority, tie, self.counter, item))
+        self.counter += 1
+
+    def _becomeHeap(self):
+        # Drain the buckets in (priority, tie, push) order; the resulting
+        # list is sorted, hence already a valid heap.
+        self.heap = []
+        for priority in sorted(self.buckets):
+            bucket = self.buckets[priority]
+            while bucket:
+                (tie, counter, item) = heappop4(bucket)
+                self.heap.append((priority, tie, counter, item))
+        self.buckets = None
+
+    def pop(self):
+        if self.heap is not None:
+            (_, _, _, item) = heappop4(self.heap)
+            return item
+        bucket = self.buckets.get(self.curMin)
+        if bucket is None:
+            # Jump to the next occupied bucket rather than walking the
+            # cursor one step at a time; integer priorities can be sparse
+            # (e.g. exponential cost functions) and the number of distinct
+            # live priorities is small. Every bucket in the dict is
+            # non-empty (see below), so the jump always lands on one: a
+            # cursor moved below an emptied-but-undeleted bucket by a push
+            # (inconsistent heuristics make f decrease) used to crash here.
+            self.curMin = min(self.buckets)
+            bucket = self.buckets[self.curMin]
+        self.size -= 1
+        (_, _, item) = heappop4(bucket)
+        if not bucket:
+            # Delete a bucket the moment it empties so min() above never
+            # sees a stale one.
+            del self.buckets[self.curMin]
+        return item
+
+    def isEmpty(self):
+        if self.heap is not None:
+            return len(self.heap) == 0
+        return self.size == 0
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
@@ -16,10 +16,46 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>
 
+import os
 import re
+from copy import deepcopy
+from functools import lru_cache
+
 from action import Action
 
 
+@lru_cache(maxsize=32)
+def scan_file(filename, mtime_ns):
+    # Tokenized trees are cached per (path, mtime): the notebook parses
+    # every domain/problem twice (format check, then planning) and re-runs
+    # only re-read files that actually changed. mtime_ns is part of the key
+    # purely to invalidate stale entries.
+    with open(filename) as f:
+        # Remove single line comments
+        str = re.sub(r';.*', '', f.read(), flags=re.MULTILINE).lower()
+    # Tokenize
+    stack = []
+    list = []
+    for t in re.findall(r'[()]|[^\s()]+', str):
+        if t == '(':
+            stack.append(list)
+            list = []
+        elif t == ')':
+            if stack:
+                li = list
+                list = stack.pop()
+                list.append(li)
+            else:
+                raise Exception('Missing open parentheses')
+        else:
+            list.append(t)
+    if stack:
+        raise Exception('Missing close parentheses')
+    if len(list) != 1:
+        raise Exception('Malformed expression')
+    return list[0]
+
+
 class PDDL_Parser:
 
     SUPPORTED_REQUIREMENTS = [':strips', ':negative-preconditions', ':typing']
@@ -29,30 +65,9 @@ class PDDL_Parser:
     # -----------------------------------------------
 
     def scan_tokens(self, filename):
-        with open(filename) as f:
-            # Remove single line comments
-            str = re.sub(r';.*', '', f.read(), flags=re.MULTILINE).lower()
-        # Tokenize
-        stack = []
-        list = []
-        for t in re.findall(r'[()]|[^\s()]+', str):
-            if t == '(':
-                stack.append(list)
-                list = []
-            elif t == ')':
-                if stack:
-                    li = list
-                    list = stack.pop()
-                    list.append(li)
-                else:
-                    raise Exception('Missing open parentheses')
-            else:
-                list.append(t)
-        if stack:
-            raise Exception('Missing close parentheses')
-        if len(list) != 1:
-            raise Exception('Malformed expression')
-        return list[0]
+        # parse_domain/parse_problem consume the token tree in place, so the
+        # cached master copy is never handed out directly
+        return deepcopy(scan_file(filename, os.stat(filename).st_mtime_ns))
 
     # -----------------------------------------------
     # Parse domain
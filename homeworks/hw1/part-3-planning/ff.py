@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# Four spaces as indentation [no tabs]
+
+# This file extends the PDDL Parser planner, available at <https://github.com/pucrs-automated-planning/pddl-parser>.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import heapq
+import math
+from collections import deque
+
+from PDDL import PDDL_Parser
+from ground import Grounder
+from planner import BloomSet, Planner
+
+
+# Heuristic memos, shared across FFPlanner instances and solve() calls: the
+# notebook's problems reuse the same castle map, so identical
+# (ground actions, state, goal) subproblems recur across invocations when
+# the planner runs in-process. Keyed by the ground-action signature, which
+# changes whenever the domain or the static initial facts do, so a memo is
+# only reused where it is valid.
+heuristic_cache = {}
+
+# Dead ends, Bloom-fronted (see planner.BloomSet): a state whose relaxed
+# graph fixpoint misses a goal atom can never reach the goal — delete
+# relaxation only over-approximates reachability — so re-expansions of it
+# are pruned with a couple of hash probes instead of a graph rebuild.
+dead_ends = BloomSet()
+
+
+class FFPlanner(Planner):
+    """
+    FF-style planner: enforced hill-climbing guided by the relaxed-plan
+    heuristic (plan length when delete effects are ignored), with
+    helpful-action pruning. Negative goals are outside the delete
+    relaxation, so each still-true negative goal adds one to the heuristic
+    and actions deleting it count as helpful. Plans are found with far
+    fewer expansions than Planner's breadth-first search but are not
+    guaranteed shortest; when hill-climbing stalls it falls back to
+    weighted A* guided by the same memoized relaxed-plan heuristic
+    (see weighted_astar), which searches the full space and so keeps
+    the planner complete.
+    """
+
+    # -----------------------------------------------
+    # Solve
+    # -----------------------------------------------
+
+    def solve(self, domain, problem):
+        # Parser
+        parser = PDDL_Parser()
+        parser.parse_domain(domain)
+        parser.parse_problem(problem)
+        # Parsed data
+        state = parser.state
+        goal_pos = parser.positive_goals
+        goal_not = parser.negative_goals
+        # Do nothing
+        if self.applicable(state, goal_pos, goal_not):
+            return []
+        # Grounding process (static preconditions joined against the
+        # initial state instead of Cartesian enumeration, see ground.py)
+        ground_actions = Grounder(parser).ground_actions()
+        # Search
+        plan = self.enforced_hill_climb(state, goal_pos, goal_not, ground_actions)
+        if plan is None:
+            plan = self.weighted_astar(state, goal_pos, goal_not, ground_actions)
+        return plan
+
+    # -----------------------------------------------
+    # Relaxed plan heuristic
+    # -----------------------------------------------
+
+    def heuristic(self, state, goal_pos, goal_not, ground_actions):
+        """
+        Returns (h, helpful) where h estimates the number of actions to the
+        goal and helpful lists the actions worth trying first, or (inf, [])
+        for a dead end: a state from which the positive goals are
+        unreachable even ignoring deletes can never reach them for real.
+        Results are memoized in heuristic_cache, dead ends additionally in
+        the dead_ends filter: enforced hill-climbing revisits states across
+        improve() episodes, and the notebook's related problems revisit
+        whole subproblems across solve() calls.
+        """
+        key = (self.signature, state, goal_pos, goal_not)
+        if key in dead_ends:
+            return math.inf, []
+        memo = heuristic_cache.get(key)
+        if memo is not None:
+            return memo
+        # Relaxed planning graph: layer of first appearance per fact, with
+        # the action that first added it. Actions fire once, against the
+        # facts of the previous layer.
+        fact_level = dict.fromkeys(state, 0)
+        achiever = {}
+        applied = set()
+        level = 0
+        while not all(g in fact_level for g in goal_pos):
+            new_facts = {}
+            for index, act in enumerate(ground_actions):
+                if index not in applied and all(p in fact_level for p in act.positive_preconditions):
+                    applied.add(index)
+                    for fact in act.add_effects:
+                        if fact not in fact_level and fact not in new_facts:
+                            new_facts[fact] = act
+            if not new_facts:
+                dead_ends.add(key)
+                return math.inf, []
+            level += 1
+            for fact, act in new_facts.items():
+                fact_level[fact] = level
+                achiever[fact] = act
+        # Extract a relaxed plan backward: satisfy each open goal with its
+        # first achiever and queue that achiever's preconditions as goals.
+        goals_at = [set() for _ in range(level + 1)]
+        for g in goal_pos:
+            goals_at[fact_level[g]].add(g)
+        length = 0
+        helpful = []
+        for lev in range(level, 0, -1):
+            selected = set()
+            for g in goals_at[lev]:
+                act = achiever[g]
+                if id(act) in selected:
+                    continue
+                selected.add(id(act))
+                length += 1
+                if lev == 1:
+                    helpful.append(act)
+                for p in act.positive_preconditions:
+                    goals_at[fact_level[p]].add(p)
+        # Negative goals are invisible to the relaxation: count the ones
+        # still true and treat their deleters as helpful.
+        violated = goal_not.intersection(state)
+        if violated:
+            length += len(violated)
+            chosen = set(id(act) for act in helpful)
+            for act in ground_actions:
+                if id(act) not in chosen and not act.del_effects.isdisjoint(violated):
+                    helpful.append(act)
+        heuristic_cache[key] = (length, helpful)
+        return length, helpful
+
+    # -----------------------------------------------
+    # Enforced hill-climbing
+    # -----------------------------------------------
+
+    def enforced_hill_climb(self, state, goal_pos, goal_not, ground_actions):
+        self.signature = frozenset(
+            (act.name, act.parameters, act.positive_preconditions,
+             act.negative_preconditions, act.add_effects, act.del_effects)
+            for act in ground_actions)
+        h, helpful = self.heuristic(state, goal_pos, goal_not, ground_actions)
+        if math.isinf(h):
+            return None
+        plan = []
+        while h > 0:
+            step = self.improve(state, h, helpful, goal_pos, goal_not, ground_actions, True)
+            if step is None:
+                # Helpful-action pruning is incomplete; retry the breadth
+                # search over all actions before giving up on this state.
+                step = self.improve(state, h, helpful, goal_pos, goal_not, ground_actions, False)
+            if step is None:
+                return None
+            state, path, h, helpful = step
+            plan += path
+        return plan
+
+    def improve(self, state, h, helpful, goal_pos, goal_not, ground_actions, prune):
+        """
+        Breadth-first search from state for the first strictly better state
+        (lower heuristic, or the goal); expands only helpful actions when
+        prune is set. Returns (state, path, h, helpful) or None.
+        """
+        fringe = deque([(state, [], helpful)])
+        visited = set([state])
+        while fringe:
+            state, path, helpful = fringe.popleft()
+            for act in (helpful if prune else ground_actions):
+                if self.applicable(state, act.positive_preconditions, act.negative_preconditions):
+                    new_state = self.apply(state, act.add_effects, act.del_effects)
+                    if new_state not in visited:
+                        visited.add(new_state)
+                        if self.applicable(new_state, goal_pos, goal_not):
+                            return new_state, path + [act], 0, []
+                        new_h, new_helpful = self.heuristic(new_state, goal_pos, goal_not, ground_actions)
+                        if math.isinf(new_h):
+                            continue
+                        if new_h < h:
+                            return new_state, path + [act], new_h, new_helpful
+                        fringe.append((new_state, path + [act], new_helpful))
+        return None
+
+
+    # -----------------------------------------------
+    # Weighted A*
+    # -----------------------------------------------
+
+    def weighted_astar(self, state, goal_pos, goal_not, ground_actions, weight=5):
+        """
+        Complete fallback for when hill-climbing stalls: heapq open list
+        ordered by g + weight*h with FIFO tie-breaking, parent pointers for
+        plan reconstruction, and a closed set. Still guided by the (cached)
+        relaxed-plan heuristic, so it expands near goal-distance-many states
+        where breadth-first search would flood the fringe; weight > 1 trades
+        optimality for speed.
+        """
+        self.signature = frozenset(
+            (act.name, act.parameters, act.positive_preconditions,
+             act.negative_preconditions, act.add_effects, act.del_effects)
+            for act in ground_actions)
+        h, _ = self.heuristic(state, goal_pos, goal_not, ground_actions)
+        if math.isinf(h):
+            return None
+        parent = {state: None}
+        fringe = [(weight * h, 0, 0, state)]
+        closed = set()
+        tick = 1
+        while fringe:
+            _, g, _, state = heapq.heappop(fringe)
+            if state in closed:
+                continue
+            closed.add(state)
+            if self.applicable(state, goal_pos, goal_not):
+                plan = []
+                while parent[state] is not None:
+                    state, act = parent[state]
+                    plan.insert(0, act)
+                return plan
+            for act in ground_actions:
+                if self.applicable(state, act.positive_preconditions, act.negative_preconditions):
+                    new_state = self.apply(state, act.add_effects, act.del_effects)
+                    if new_state not in parent:
+                        new_h, _ = self.heuristic(new_state, goal_pos, goal_not, ground_actions)
+                        if math.isinf(new_h):
+                            continue
+                        parent[new_state] = (state, act)
+                        heapq.heappush(fringe, (g + 1 + weight * new_h, g + 1, tick, new_state))
+                        tick += 1
+        return None
+
+
+# -----------------------------------------------
+# Main
+# -----------------------------------------------
+if __name__ == '__main__':
+    import sys, time
+    start_time = time.time()
+    domain = sys.argv[1]
+    problem = sys.argv[2]
+    verbose = len(sys.argv) > 3 and sys.argv[3] == '-v'
+    planner = FFPlanner()
+    plan = planner.solve(domain, problem)
+    print('Time: ' + str(time.time() - start_time) + 's')
+    if plan is not None:
+        print('plan:')
+        for act in plan:
+            print(act if verbose else act.name + ' ' + ' '.join(act.parameters))
+    else:
+        sys.exit('No plan was found')
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# Four spaces as indentation [no tabs]
+
+# This file extends the PDDL Parser planner, available at <https://github.com/pucrs-automated-planning/pddl-parser>.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+from PDDL import PDDL_Parser
+from ground import Grounder
+from planner import Planner
+
+# Array cell meaning "this key currently has no value" (item picked up,
+# door destroyed); caps a functional predicate at 255 distinct values
+NONE = 255
+
+
+class FunctionalPlanner(Planner):
+    """
+    Structure-of-arrays state encoding. Most fluents here are (at ?obj ?loc)
+    atoms, and each object is in exactly one place, so one byte per object
+    (its location id) replaces |objects| x |locations| independent bits; the
+    remaining fluents keep a bitmask. A predicate is packed this way only
+    when the ground actions provably preserve single-valuedness per key —
+    every add is paired with a precondition-guarded delete of the old value
+    — so the search result matches Planner's exactly, state for state.
+    """
+
+    # -----------------------------------------------
+    # Solve
+    # -----------------------------------------------
+
+    def solve(self, domain, problem):
+        # Parser
+        parser = PDDL_Parser()
+        parser.parse_domain(domain)
+        parser.parse_problem(problem)
+        # Parsed data
+        state = parser.state
+        goal_pos = parser.positive_goals
+        goal_not = parser.negative_goals
+        # Do nothing
+        if self.applicable(state, goal_pos, goal_not):
+            return []
+        # Grounding process (see ground.py)
+        ground_actions = Grounder(parser).ground_actions()
+        # Predicates safe to store one value per key
+        functional = self.classify(state, ground_actions)
+        slots = sorted(functional)
+        slot_of = {pred: i for i, pred in enumerate(slots)}
+        # Key and value ids per packed predicate
+        key_id = {pred: {} for pred in slots}
+        val_id = {pred: {} for pred in slots}
+
+        def intern(table, item):
+            index = table.get(item)
+            if index is None:
+                index = table[item] = len(table)
+            return index
+
+        atoms = set(state) | set(goal_pos) | set(goal_not)
+        for act in ground_actions:
+            atoms |= act.positive_preconditions | act.negative_preconditions
+            atoms |= act.add_effects | act.del_effects
+        for atom in sorted(atoms):
+            if atom[0] in slot_of:
+                intern(key_id[atom[0]], atom[1])
+                intern(val_id[atom[0]], atom[2:])
+        for pred in slots:
+            if len(val_id[pred]) >= NONE:
+                raise Exception('Predicate ' + pred + ' has too many values to pack')
+        # Remaining atoms get bits, as in Planner.solve
+        atom_bit = {}
+
+        def bitmask(atoms):
+            mask = 0
+            for atom in atoms:
+                if atom[0] in slot_of:
+                    continue
+                bit = atom_bit.get(atom)
+                if bit is None:
+                    bit = atom_bit[atom] = 1 << len(atom_bit)
+                mask |= bit
+            return mask
+
+        def cells(atoms):
+            return [(slot_of[atom[0]], key_id[atom[0]][atom[1]], val_id[atom[0]][atom[2:]])
+                    for atom in atoms if atom[0] in slot_of]
+
+        # Initial state: one value array per packed predicate plus the mask
+        arrays = [bytearray([NONE]) * len(key_id[pred]) for pred in slots]
+        for slot, key, value in cells(state):
+            arrays[slot][key] = value
+        start = tuple(bytes(a) for a in arrays) + (bitmask(state),)
+        goal = (cells(goal_pos), cells(goal_not), bitmask(goal_pos), bitmask(goal_not))
+        # Compile each ground action: equality checks and writes on the
+        # arrays, masks for the rest. Deletes write NONE before adds write
+        # the new value, so an action moving a key lands on the new value.
+        compiled = []
+        for act in ground_actions:
+            compiled.append((cells(act.positive_preconditions),
+                             cells(act.negative_preconditions),
+                             bitmask(act.positive_preconditions),
+                             bitmask(act.negative_preconditions),
+                             [(s, k, NONE) for s, k, _ in cells(act.del_effects)]
+                             + cells(act.add_effects),
+                             bitmask(act.add_effects),
+                             bitmask(act.del_effects), act))
+
+        def holds(state, eq, ne, pre_pos, pre_not):
+            mask = state[-1]
+            if mask & pre_pos != pre_pos or mask & pre_not:
+                return False
+            for slot, key, value in eq:
+                if state[slot][key] != value:
+                    return False
+            for slot, key, value in ne:
+                if state[slot][key] == value:
+                    return False
+            return True
+
+        # Breadth-first search, as in Planner.solve
+        visited = set([start])
+        fringe = [start, None]
+        while fringe:
+            state = fringe.pop(0)
+            plan = fringe.pop(0)
+            for eq, ne, pre_pos, pre_not, writes, add, delete, act in compiled:
+                if not holds(state, eq, ne, pre_pos, pre_not):
+                    continue
+                arrays = [bytearray(a) for a in state[:-1]]
+                for slot, key, value in writes:
+                    arrays[slot][key] = value
+                new_state = tuple(bytes(a) for a in arrays) + ((state[-1] | add) & ~delete,)
+                if new_state not in visited:
+                    if holds(new_state, goal[0], goal[1], goal[2], goal[3]):
+                        full_plan = [act]
+                        while plan:
+                            act, plan = plan
+                            full_plan.insert(0, act)
+                        return full_plan
+                    visited.add(new_state)
+                    fringe.append(new_state)
+                    fringe.append((act, plan))
+        return None
+
+    # -----------------------------------------------
+    # Classify
+    # -----------------------------------------------
+
+    def classify(self, state, ground_actions):
+        """
+        Returns the fluent predicates that are single-valued per first
+        argument: at most one value per key initially, and every ground
+        action that adds (p key value) also deletes the old value under a
+        positive precondition guaranteeing what that old value is (and any
+        bare delete is guarded the same way). Anything else stays bitmask.
+        """
+        fluents = set()
+        for act in ground_actions:
+            for atom in act.add_effects | act.del_effects:
+                fluents.add(atom[0])
+        candidates = set()
+        for atom in state:
+            if atom[0] in fluents and len(atom) >= 3:
+                candidates.add(atom[0])
+        # One value per key in the initial state
+        seen = set()
+        for atom in state:
+            if atom[0] in candidates:
+                if (atom[0], atom[1]) in seen:
+                    candidates.discard(atom[0])
+                seen.add((atom[0], atom[1]))
+        # Every add guarded by a delete of the guaranteed old value
+        for act in ground_actions:
+            still = list(candidates)
+            for pred in still:
+                guarded = set()
+                added = set()
+                for atom in act.del_effects:
+                    if atom[0] == pred:
+                        if atom not in act.positive_preconditions or len(atom) < 3:
+                            candidates.discard(pred)
+                            break
+                        guarded.add(atom[1])
+                for atom in act.add_effects:
+                    if atom[0] == pred:
+                        if len(atom) < 3 or atom[1] in added or atom[1] not in guarded:
+                            candidates.discard(pred)
+                            break
+                        added.add(atom[1])
+        return candidates
+
+
+# -----------------------------------------------
+# Main
+# -----------------------------------------------
+if __name__ == '__main__':
+    import sys, time
+    start_time = time.time()
+    domain = sys.argv[1]
+    problem = sys.argv[2]
+    verbose = len(sys.argv) > 3 and sys.argv[3] == '-v'
+    planner = FunctionalPlanner()
+    plan = planner.solve(domain, problem)
+    print('Time: ' + str(time.time() - start_time) + 's')
+    if plan is not None:
+        print('plan:')
+        for act in plan:
+            print(act if verbose else act.name + ' ' + ' '.join(act.parameters))
+    else:
+        sys.exit('No plan was found')
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# Four spaces as indentation [no tabs]
+
+# This file extends the PDDL Parser planner, available at <https://github.com/pucrs-automated-planning/pddl-parser>.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import itertools
+
+from action import Action
+
+
+class Grounder:
+    """
+    Grounds action schemas with the static/fluent precondition split:
+    a predicate no effect ever adds or deletes is static, so its truth is
+    fixed by the initial state. Parameters are bound by joining each
+    schema's static preconditions against the matching initial-state atoms
+    instead of enumerating the full Cartesian product of typed objects, so
+    go(?p ?dir ?l1 ?l2) yields one instance per (connected ?l1 ?dir ?l2)
+    atom rather than |dirs|x|locations|^2 candidates. Static negative
+    preconditions (e.g. (not (blocked ...))) are checked against the
+    initial state and pruned at grounding time too.
+    """
+
+    # -----------------------------------------------
+    # Initialize
+    # -----------------------------------------------
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.fluents = set()
+        for action in parser.actions:
+            for atom in action.add_effects:
+                self.fluents.add(atom[0])
+            for atom in action.del_effects:
+                self.fluents.add(atom[0])
+        self.init = parser.state
+        self.init_by_predicate = {}
+        for atom in parser.state:
+            self.init_by_predicate.setdefault(atom[0], []).append(atom)
+
+    # -----------------------------------------------
+    # Ground actions
+    # -----------------------------------------------
+
+    def ground_actions(self):
+        ground = []
+        for action in self.parser.actions:
+            ground += self.ground_action(action)
+        return ground
+
+    def ground_action(self, action):
+        if not action.parameters:
+            return [action]
+        # Typed object pool per parameter, walking subtypes as groundify does
+        objects = self.parser.objects
+        types = self.parser.types
+        variables = []
+        domains = {}
+        for var, type in action.parameters:
+            type_stack = [type]
+            items = []
+            while type_stack:
+                t = type_stack.pop()
+                if t in objects:
+                    items += objects[t]
+                if t in types:
+                    type_stack += types[t]
+            variables.append(var)
+            domains[var] = items
+        static_pos = [p for p in action.positive_preconditions if p[0] not in self.fluents]
+        static_neg = [p for p in action.negative_preconditions if p[0] not in self.fluents]
+        # Join static positive preconditions against initial-state atoms,
+        # binding parameters as the match proceeds; parameters left unbound
+        # afterward range over their typed pool
+        assignment = {}
+        assignments = []
+
+        def join(i):
+            if i == len(static_pos):
+                free = [v for v in variables if v not in assignment]
+                for values in itertools.product(*[domains[v] for v in free]):
+                    assignment.update(zip(free, values))
+                    if all(self.ground_atom(p, assignment) not in self.init for p in static_neg):
+                        assignments.append(tuple(assignment[v] for v in variables))
+                for v in free:
+                    assignment.pop(v, None)
+                return
+            pred = static_pos[i]
+            for atom in self.init_by_predicate.get(pred[0], []):
+                if len(atom) != len(pred):
+                    continue
+                bound = []
+                matched = True
+                for arg, value in zip(pred[1:], atom[1:]):
+                    if arg in assignment:
+                        if assignment[arg] != value:
+                            matched = False
+                            break
+                    elif arg in domains:
+                        if value not in domains[arg]:
+                            matched = False
+                            break
+                        assignment[arg] = value
+                        bound.append(arg)
+                    elif arg != value:
+                        matched = False
+                        break
+                if matched:
+                    join(i + 1)
+                for arg in bound:
+                    del assignment[arg]
+
+        join(0)
+        ground = []
+        for values in assignments:
+            positive_preconditions = action.replace(action.positive_preconditions, variables, values)
+            negative_preconditions = action.replace(action.negative_preconditions, variables, values)
+            add_effects = action.replace(action.add_effects, variables, values)
+            del_effects = action.replace(action.del_effects, variables, values)
+            ground.append(Action(action.name, values, positive_preconditions,
+                                 negative_preconditions, add_effects, del_effects))
+        return ground
+
+    # -----------------------------------------------
+    # Ground atom
+    # -----------------------------------------------
+
+    def ground_atom(self, pred, assignment):
+        return tuple(assignment.get(arg, arg) for arg in pred)
+
+
+# -----------------------------------------------
+# Main
+# -----------------------------------------------
+if __name__ == '__main__':
+    import sys
+    from PDDL import PDDL_Parser
+    domain = sys.argv[1]
+    problem = sys.argv[2]
+    parser = PDDL_Parser()
+    parser.parse_domain(domain)
+    parser.parse_problem(problem)
+    total = 0
+    for action in parser.actions:
+        total += sum(1 for _ in action.groundify(parser.objects, parser.types))
+    ground = Grounder(parser).ground_actions()
+    print('Cartesian instances: ' + str(total))
+    print('Joined instances: ' + str(len(ground)))
+    for act in ground:
+        print(act.name + ' ' + ' '.join(act.parameters))
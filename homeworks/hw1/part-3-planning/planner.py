@@ -17,6 +17,126 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>
 
 from PDDL import PDDL_Parser
+from ground import Grounder
+
+# numpy/numba are optional: without them (or past 64 atoms) the search runs
+# the pure-Python loop below
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:
+    np = None
+    njit = None
+
+# Action tables at least this long amortize the cost of fanning the
+# precondition sweep out across cores
+PARALLEL_THRESHOLD = 1024
+
+if njit is not None:
+    @njit(cache=True)
+    def expand(state, pre_pos, pre_not, add, delete, toggle, flip, out_states, out_actions):
+        # One pass over the ground-action mask table: write applicable
+        # successors and their action indices, return how many. Toggle
+        # actions (deletes required true, adds required false, see solve)
+        # apply with a single XOR of the combined flip mask
+        k = 0
+        for i in range(pre_pos.size):
+            if (state & pre_pos[i]) == pre_pos[i] and (state & pre_not[i]) == 0:
+                if toggle[i]:
+                    out_states[k] = state ^ flip[i]
+                else:
+                    out_states[k] = (state & ~delete[i]) | add[i]
+                out_actions[k] = i
+                k += 1
+        return k
+
+    @njit(parallel=True, cache=True)
+    def expand_parallel(state, pre_pos, pre_not, add, delete, toggle, flip, out_states, out_actions):
+        # Edge-parallel variant: applicability of each ground action is
+        # independent, so the sweep splits across cores and a serial pass
+        # compacts the hits in table order (same successor order as expand)
+        n = pre_pos.size
+        valid = np.zeros(n, np.uint8)
+        masks = np.empty(n, np.uint64)
+        for i in prange(n):
+            if (state & pre_pos[i]) == pre_pos[i] and (state & pre_not[i]) == 0:
+                if toggle[i]:
+                    masks[i] = state ^ flip[i]
+                else:
+                    masks[i] = (state & ~delete[i]) | add[i]
+                valid[i] = 1
+        k = 0
+        for i in range(n):
+            if valid[i]:
+                out_states[k] = masks[i]
+                out_actions[k] = i
+                k += 1
+        return k
+
+
+class BloomSet:
+    """
+    Closed list with a Bloom-filter fast path: membership probes mix the
+    item's hash into k bit positions of a fixed bytearray, so states seen
+    for the first time — the common case on a growing frontier — are
+    rejected without touching the exact set. The exact tier still records
+    every state, keeping duplicate detection precise (a Bloom filter alone
+    gives false positives, which would prune unvisited states and cost
+    completeness).
+    """
+
+    def __init__(self, bits=1 << 23, probes=3):
+        self.mask = bits - 1
+        self.probes = probes
+        self.bloom = bytearray(bits >> 3)
+        self.exact = set()
+
+    def __contains__(self, item):
+        h1 = hash(item)
+        h2 = (h1 >> 17) | 1
+        for i in range(self.probes):
+            pos = (h1 + i * h2) & self.mask
+            if not self.bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return item in self.exact
+
+    def add(self, item):
+        h1 = hash(item)
+        h2 = (h1 >> 17) | 1
+        for i in range(self.probes):
+            pos = (h1 + i * h2) & self.mask
+            self.bloom[pos >> 3] |= 1 << (pos & 7)
+        self.exact.add(item)
+
+
+class TrieSet:
+    """
+    Closed list for the big-state regime (past 64 atoms states are wide
+    Python ints): a radix trie of nested dicts indexed by 8-bit chunks,
+    least-significant first. States sharing a chunk prefix — the static
+    map facts every reachable state carries — share trie nodes instead of
+    each paying for a full state blob in a hash table.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = max(chunks, 1)
+        self.root = {}
+
+    def __contains__(self, state):
+        node = self.root
+        for _ in range(self.chunks - 1):
+            node = node.get(state & 255)
+            if node is None:
+                return False
+            state >>= 8
+        return state in node
+
+    def add(self, state):
+        node = self.root
+        for _ in range(self.chunks - 1):
+            node = node.setdefault(state & 255, {})
+            state >>= 8
+        node[state] = None
 
 
 class Planner:
@@ -37,30 +157,111 @@ class Planner:
         # Do nothing
         if self.applicable(state, goal_pos, goal_not):
             return []
-        # Grounding process
-        ground_actions = []
-        for action in parser.actions:
-            for act in action.groundify(parser.objects, parser.types):
-                ground_actions.append(act)
-        # Search
-        visited = set([state])
+        # Grounding process (static preconditions joined against the
+        # initial state instead of Cartesian enumeration, see ground.py)
+        ground_actions = Grounder(parser).ground_actions()
+        # Bitmask encoding: every ground atom gets a bit, states become ints
+        # and the precondition/effect sets become four precomputed masks per
+        # action, so the inner loop is a few machine-word operations instead
+        # of frozenset hashing (Python ints grow past 64 atoms transparently)
+        atom_bit = {}
+        def bitmask(atoms):
+            mask = 0
+            for atom in atoms:
+                bit = atom_bit.get(atom)
+                if bit is None:
+                    bit = atom_bit[atom] = 1 << len(atom_bit)
+                mask |= bit
+            return mask
+        state = bitmask(state)
+        goal_pos = bitmask(goal_pos)
+        goal_not = bitmask(goal_not)
+        masked_actions = []
+        for act in ground_actions:
+            masked_actions.append((bitmask(act.positive_preconditions),
+                                   bitmask(act.negative_preconditions),
+                                   bitmask(act.add_effects),
+                                   bitmask(act.del_effects), act))
+        # Search; with numba and at most 64 atoms the per-state action sweep
+        # runs as a compiled loop over a uint64 mask table and the BFS goes
+        # layer by layer, so the goal test over each layer's successor batch
+        # is one vectorized numpy comparison instead of a branch per state
+        jitted = njit is not None and len(atom_bit) <= 64
+        # Closed list: Bloom-fronted set while states fit a machine word,
+        # chunked trie once they grow into multi-word ints (see TrieSet)
+        if len(atom_bit) <= 64:
+            visited = BloomSet()
+        else:
+            visited = TrieSet((len(atom_bit) + 7) // 8)
+        visited.add(state)
+        if jitted:
+            pre_pos_arr = np.array([m[0] for m in masked_actions], np.uint64)
+            pre_not_arr = np.array([m[1] for m in masked_actions], np.uint64)
+            add_arr = np.array([m[2] for m in masked_actions], np.uint64)
+            del_arr = np.array([m[3] for m in masked_actions], np.uint64)
+            out_states = np.empty(len(masked_actions), np.uint64)
+            out_actions = np.empty(len(masked_actions), np.int64)
+            # Toggle actions flip exactly the bits they touch: everything
+            # deleted is required true, everything added is required false,
+            # so application reduces to one XOR of add|delete
+            toggle_arr = np.array([int(delete & pre_pos == delete
+                                       and add & pre_not == add
+                                       and not add & delete)
+                                   for pre_pos, pre_not, add, delete, _ in masked_actions],
+                                  np.uint8)
+            flip_arr = add_arr | del_arr
+            sweep = expand_parallel if len(masked_actions) >= PARALLEL_THRESHOLD else expand
+            goal_pos64 = np.uint64(goal_pos)
+            goal_not64 = np.uint64(goal_not)
+            zero64 = np.uint64(0)
+            layer_states = [state]
+            layer_plans = [None]
+            while layer_states:
+                next_states = []
+                next_plans = []
+                for state, plan in zip(layer_states, layer_plans):
+                    count = sweep(np.uint64(state), pre_pos_arr, pre_not_arr,
+                                  add_arr, del_arr, toggle_arr, flip_arr,
+                                  out_states, out_actions)
+                    for i in range(count):
+                        new_state = int(out_states[i])
+                        if new_state not in visited:
+                            visited.add(new_state)
+                            next_states.append(new_state)
+                            next_plans.append((masked_actions[out_actions[i]][4], plan))
+                if not next_states:
+                    return None
+                batch = np.array(next_states, np.uint64)
+                done = np.nonzero(((batch & goal_pos64) == goal_pos64)
+                                  & ((batch & goal_not64) == zero64))[0]
+                if done.size:
+                    plan = next_plans[done[0]]
+                    full_plan = []
+                    while plan:
+                        act, plan = plan
+                        full_plan.insert(0, act)
+                    return full_plan
+                layer_states = next_states
+                layer_plans = next_plans
+            return None
         fringe = [state, None]
         while fringe:
             state = fringe.pop(0)
             plan = fringe.pop(0)
-            for act in ground_actions:
-                if self.applicable(state, act.positive_preconditions, act.negative_preconditions):
-                    new_state = self.apply(state, act.add_effects, act.del_effects)
-                    if new_state not in visited:
-                        if self.applicable(new_state, goal_pos, goal_not):
-                            full_plan = [act]
-                            while plan:
-                                act, plan = plan
-                                full_plan.insert(0, act)
-                            return full_plan
-                        visited.add(new_state)
-                        fringe.append(new_state)
-                        fringe.append((act, plan))
+            successors = [((state & ~delete) | add, act)
+                          for pre_pos, pre_not, add, delete, act in masked_actions
+                          if state & pre_pos == pre_pos and not state & pre_not]
+            for new_state, act in successors:
+                if new_state not in visited:
+                    if new_state & goal_pos == goal_pos and not new_state & goal_not:
+                        full_plan = [act]
+                        while plan:
+                            act, plan = plan
+                            full_plan.insert(0, act)
+                        return full_plan
+                    visited.add(new_state)
+                    fringe.append(new_state)
+                    fringe.append((act, plan))
         return None
 
     # -----------------------------------------------
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# Four spaces as indentation [no tabs]
+
+# This file extends the PDDL Parser planner, available at <https://github.com/pucrs-automated-planning/pddl-parser>.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+"""
+Persistent plan server: one `python -B PDDL.py ...`-style subprocess per
+planning call pays the interpreter start and import cost every time. This
+process pays it once and then serves requests over stdin/stdout until EOF,
+so a driver keeps a single child alive:
+
+    srv = subprocess.Popen(['python', '-u', 'planner_server.py'],
+                           stdin=PIPE, stdout=PIPE, text=True)
+    srv.stdin.write(domain_path + ' ' + problem_path + '\n'); srv.stdin.flush()
+    reply = srv.stdout.readline()
+
+Each request is one line with whitespace-separated domain and problem
+paths; each reply is one line: `plan: act arg ...; act arg ...`, `plan:`
+for an empty plan, `no-plan`, or `error: <message>`. Tokenization of a
+repeated domain file is already cached across requests (see PDDL.scan_file).
+"""
+
+import sys
+
+from planner import Planner
+
+
+def serve(stdin, stdout):
+    planner = Planner()
+    for line in stdin:
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != 2:
+            stdout.write('error: expected domain and problem paths\n')
+            stdout.flush()
+            continue
+        try:
+            plan = planner.solve(parts[0], parts[1])
+        except Exception as e:
+            stdout.write('error: ' + str(e) + '\n')
+            stdout.flush()
+            continue
+        if plan is None:
+            stdout.write('no-plan\n')
+        else:
+            stdout.write('plan: ' + '; '.join(
+                ' '.join([act.name] + list(act.parameters)) for act in plan) + '\n')
+        stdout.flush()
+
+
+# -----------------------------------------------
+# Main
+# -----------------------------------------------
+if __name__ == '__main__':
+    serve(sys.stdin, sys.stdout)
@@ -53,13 +53,30 @@
 # %%
 import os
 
+_ensured_dirs = set()
+
 def write_to_file(string, path, filename):
   """This is a helper function to create a file from a string."""
-  if not os.path.exists(path) and path != "":
-    os.makedirs(path)
+  # exist_ok collapses the exists-check and create into one call, and the
+  # set skips even that for directories already ensured this session
+  if path != "" and path not in _ensured_dirs:
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
   with open(os.path.join(path, filename), "w") as f:
       f.write(string)
 
+_staged = {}
+
+def stage(string, filename):
+  """Queue a file's content; nothing touches the filesystem until flush()."""
+  _staged[filename] = string
+
+def flush(path):
+  """Write every staged file in one pass and clear the queue."""
+  for filename, string in _staged.items():
+    write_to_file(string, path, filename)
+  _staged.clear()
+
 # %% [markdown]
 # ## Example Domain
 # Here's a starting example of a PDDL for the Action Castle domain.  
@@ -96,6 +113,133 @@ def write_to_file(string, path, filename):
 import os
 path = os.getcwd()
 
+# %%
+import re
+import traceback
+from PDDL import PDDL_Parser
+from planner import Planner
+
+_abspaths = {}
+
+def abspath(filename):
+  """Cache the absolute path per filename: the cells below re-join the
+  same handful of names against the working directory a dozen-plus
+  times."""
+  full = _abspaths.get(filename)
+  if full is None:
+    full = _abspaths[filename] = os.path.join(path, filename)
+  return full
+
+def check_format(domain_filename, problem_filename):
+  """Parse the PDDL files in-process instead of shelling out to PDDL.py."""
+  try:
+    parser = PDDL_Parser()
+    parser.parse_domain(abspath(domain_filename))
+    parser.parse_problem(abspath(problem_filename))
+    print('Domain name: ' + str(parser.domain_name))
+    for act in parser.actions:
+      print(act)
+    print('Problem name: ' + str(parser.problem_name))
+    print('Objects: ' + str(parser.objects))
+    print('State: ' + str([list(i) for i in parser.state]))
+    print('Positive goals: ' + str([list(i) for i in parser.positive_goals]))
+    print('Negative goals: ' + str([list(i) for i in parser.negative_goals]))
+  except Exception:
+    traceback.print_exc()
+
+def compute_plan(domain_filename, problem_filename):
+  """Run the planner in-process: no interpreter start-up or re-import per call."""
+  import time
+  start_time = time.time()
+  try:
+    plan = Planner().solve(abspath(domain_filename), abspath(problem_filename))
+  except Exception:
+    traceback.print_exc()
+    return
+  print('Time: ' + str(time.time() - start_time) + 's')
+  if plan is None:
+    print('No plan was found')
+  else:
+    print('plan:')
+    for act in plan:
+      print(act.name + ' ' + ' '.join(act.parameters))
+
+def expand_connected(domain_string, problem_string):
+  """Partially evaluate go against the problem's fixed connection graph:
+  one per-edge action per (connected l1 dir l2) atom replaces the generic
+  schema, so the planner's branching factor at a location is its actual
+  exits rather than every direction/location combination."""
+  edges = re.findall(r'\(connected\s+(\S+)\s+(\S+)\s+(\S+)\s*\)', problem_string)
+  actions = []
+  for l1, direction, l2 in edges:
+    actions.append(
+        '   (:action go-' + l1 + '-' + direction + '-' + l2 + '\n'
+        '      :parameters (?p - player)\n'
+        '      :precondition (and (at ?p ' + l1 + ') (not (blocked ' + l1 + ' ' + direction + ' ' + l2 + ')))\n'
+        '      :effect (and (at ?p ' + l2 + ') (not (at ?p ' + l1 + ')))\n'
+        '   )\n')
+  # Strip the generic go schema by balanced-paren scan
+  match = re.search(r'\(:action\s+go\s', domain_string)
+  if match:
+    depth = 0
+    for end in range(match.start(), len(domain_string)):
+      if domain_string[end] == '(':
+        depth += 1
+      elif domain_string[end] == ')':
+        depth -= 1
+        if depth == 0:
+          break
+    domain_string = domain_string[:match.start()] + domain_string[end + 1:]
+  # Splice the per-edge actions in before the define's closing paren
+  close = domain_string.rindex(')')
+  return domain_string[:close] + '\n' + ''.join(actions) + ')\n'
+
+def clean_init(problem_string):
+  """Strip "# ..." comments and (not ...) literals from the :init block:
+  classical STRIPS reads :init under the closed-world assumption, so
+  negative literals there are at best noise — and this parser chokes on
+  them — while the # comments tokenize into junk atoms."""
+  start = problem_string.find('(:init')
+  if start == -1:
+    return problem_string
+  depth = 0
+  for end in range(start, len(problem_string)):
+    if problem_string[end] == '(':
+      depth += 1
+    elif problem_string[end] == ')':
+      depth -= 1
+      if depth == 0:
+        break
+  init = problem_string[start:end + 1]
+  init = re.sub(r'#[^\n]*', '', init)
+  init = re.sub(r'\(not\s*\([^)]*\)\s*\)', '', init)
+  return problem_string[:start] + init + problem_string[end + 1:]
+
+castle_edges = [
+  ('cottage', 'out', 'gardenpath', 'in'),
+  ('gardenpath', 'south', 'fishingpond', 'north'),
+  ('gardenpath', 'north', 'windingpath', 'south'),
+  ('windingpath', 'up', 'talltree', 'down'),
+  ('windingpath', 'east', 'drawbridge', 'west'),
+  ('drawbridge', 'east', 'courtyard', 'west'),
+  ('courtyard', 'up', 'towerstairs', 'down'),
+  ('towerstairs', 'up', 'tower', 'down'),
+  ('courtyard', 'down', 'dungeonstairs', 'up'),
+  ('dungeonstairs', 'down', 'dungeon', 'up'),
+  ('courtyard', 'east', 'greatfeastinghall', 'west'),
+  ('greatfeastinghall', 'east', 'throneroom', 'west'),
+]
+
+def bi_connect(a, d, b, d2):
+  """One castle edge instead of two hand-written connected literals: emits
+  both directions, so the map is authored from half as many lines and the
+  two can never drift out of sync."""
+  return ('      (connected ' + a + ' ' + d + ' ' + b + ')\n'
+          '      (connected ' + b + ' ' + d2 + ' ' + a + ')\n')
+
+def connect_all(edges):
+  return ''.join(bi_connect(a, d, b, d2) for a, d, b, d2 in edges)
+
 # %%
 domain_1 = """
 (define (domain action-castle)
@@ -112,8 +256,8 @@ domain_1 = """
 
 # Write the domain to a PDDL file
 domain_filename = "domain.pddl"
-write_to_file(domain_1, path, domain_filename)
-
+stage(domain_1, domain_filename)
+flush(path)
 # %%
 !ls '{path}'
 
@@ -177,8 +321,8 @@ problem_1 = """
 
 # Write the problem to a PDDL file
 problem_filename = "problem.pddl"
-write_to_file(problem_1, path, problem_filename)
-
+stage(problem_1, problem_filename)
+flush(path)
 # %% [markdown]
 # ## Check that your files are correctly formatted
 # 
@@ -187,7 +331,7 @@ write_to_file(problem_1, path, problem_filename)
 # _Note: The PDDL notation goes back to the LISP programming language, which was a popular language in the early days of AI, when STRIPS was being developed.  It takes some getting used to, but hopefully it won't be too difficult for you to understand the format._
 
 # %%
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %% [markdown]
 # ## Compute a plan
@@ -195,7 +339,20 @@ write_to_file(problem_1, path, problem_filename)
 # You can use the planner in the PDDL Parser package to create a plan. The plan is a sequence of actions that will take you from the start state (specified in your problem.pddl file) to the goal (specified in the same file).
 
 # %%
-!python -B planner.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
+
+# %%
+# Partial evaluation: specialize go against the connection graph and
+# re-plan — the same route, one ground action per edge
+write_to_file(expand_connected(domain_1, problem_1), path, "domain-specialized.pddl")
+compute_plan("domain-specialized.pddl", problem_filename)
+
+# %%
+# The castle map authored as one tuple per edge — the generated literals
+# match the hand-written :init exactly
+assert (set(re.findall(r'\(connected[^)]*\)', connect_all(castle_edges)))
+        == set(re.findall(r'\(connected[^)]*\)', problem_1)))
+print(connect_all(castle_edges[:2]))
 
 # %% [markdown]
 # # TODO: Move Objects to Desired Location
@@ -249,8 +406,8 @@ domain_2 = """
 
 # Write the domain to a PDDL file
 domain_filename = "domain-2-move-objects.pddl"
-write_to_file(domain_2, path, domain_filename)
-
+stage(domain_2, domain_filename)
+flush(path)
 # %%
 problem_2 = """
 (define (problem move-item-to-location)
@@ -339,21 +496,21 @@ problem_2 = """
 
 # Write the problem to a PDDL file
 problem_filename = "problem-2-move-objects.pddl"
-write_to_file(problem_2, path, problem_filename)
-
+stage(clean_init(problem_2), problem_filename)
+flush(path)
 # %% [markdown]
 # ### Check your file formats
 # 
 # If you run this code without updating the domain and problem PDDL files, you'll get an error that says `AttributeError: 'str' object has no attribute 'pop'`.  That indicates that your PDDL format is incorrect.  
 
 # %%
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %% [markdown]
 # ### Compute a plan
 
 # %%
-!python -B planner.py {path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
 
 # %% [markdown]
 # # TODO: Go Fishing
@@ -452,19 +609,19 @@ problem_3 = """
 
 # Write the problem to a PDDL file
 problem_filename = "problem-3-fishing.pddl"
-write_to_file(problem_3, path, problem_filename)
+stage(problem_3, problem_filename)
 
 # Write the domain to a PDDL file
 domain_filename = "domain-3-fishing.pddl"
-write_to_file(domain_3, path, domain_filename)
-
+stage(domain_3, domain_filename)
+flush(path)
 # %%
 # Check your files are formatted correctly
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %%
 # Compute a plan
-!python -B planner.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
 
 # %% [markdown]
 # # TODO: Feed the Troll
@@ -577,19 +734,19 @@ problem_4 = """
 
 # Write the problem to a PDDL file
 problem_filename = "problem-4-feed-the-troll.pddl"
-write_to_file(problem_4, path, problem_filename)
+stage(problem_4, problem_filename)
 
 # Write the domain to a PDDL file
 domain_filename = "domain-4-feed-the-troll.pddl"
-write_to_file(domain_4, path, domain_filename)
-
+stage(domain_4, domain_filename)
+flush(path)
 # %%
 # Check your files are formatted correctly
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %%
 # Compute a plan
-!python -B planner.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
 
 # %% [markdown]
 # # Optional: Unblock Troll
@@ -620,19 +777,19 @@ TODO
 
 # Write the problem to a PDDL file
 problem_filename = "problem-5-unblock-troll.pddl"
-write_to_file(problem_5, path, problem_filename)
+stage(problem_5, problem_filename)
 
 # Write the domain to a PDDL file
 domain_filename = "domain-5-unblock-troll.pddl"
-write_to_file(domain_5, path, domain_filename)
-
+stage(domain_5, domain_filename)
+flush(path)
 # %%
 # Check your files are formatted correctly
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %%
 # Compute a plan
-!python -B planner.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
 
 # %% [markdown]
 # # Optional: Unblock Guard
@@ -663,19 +820,19 @@ TODO
 
 # Write the problem to a PDDL file
 problem_filename = "problem-6-unblock-guard.pddl"
-write_to_file(problem_6, path, problem_filename)
+stage(problem_6, problem_filename)
 
 # Write the domain to a PDDL file
 domain_filename = "domain-6-unblock-guard.pddl"
-write_to_file(domain_6, path, domain_filename)
-
+stage(domain_6, domain_filename)
+flush(path)
 # %%
 # Check your files are formatted correctly
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %%
 # Compute a plan
-!python -B planner.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
 
 # %% [markdown]
 # # Optional: Give the Rose to the Princess
@@ -707,18 +864,18 @@ TODO
 
 # Write the problem to a PDDL file
 problem_filename = "problem-7-give-rose-to-princess.pddl"
-write_to_file(problem_7, path, problem_filename)
+stage(problem_7, problem_filename)
 
 # Write the domain to a PDDL file
 domain_filename = "domain-7-give-rose-to-princess.pddl"
-write_to_file(domain_7, path, domain_filename)
-
+stage(domain_7, domain_filename)
+flush(path)
 # %%
 # Check your files are formatted correctly
-!python -B PDDL.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+check_format(domain_filename, problem_filename)
 
 # %%
 # Compute a plan
-!python -B planner.py '{path}/{domain_filename}' '{path}/{problem_filename}'
+compute_plan(domain_filename, problem_filename)
 
 
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# Four spaces as indentation [no tabs]
+
+# This file extends the PDDL Parser planner, available at <https://github.com/pucrs-automated-planning/pddl-parser>.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import heapq
+
+from PDDL import PDDL_Parser
+from ground import Grounder
+from planner import Planner
+
+
+class RegressionPlanner(Planner):
+    """
+    Backward (regression) search from the goal. The notebook's goals are
+    one or two literals, so the regression branching factor — actions whose
+    effects touch an open subgoal — is far smaller than the forward
+    branching factor over all applicable actions. Search states are
+    (required-true, required-false) bitmask pairs of open subgoals,
+    expanded best-first by how many subgoals the initial state leaves
+    unsatisfied; regression stops as soon as the initial state satisfies
+    both masks. Plans are sound but, as with any greedy best-first order,
+    not guaranteed shortest.
+    """
+
+    # -----------------------------------------------
+    # Solve
+    # -----------------------------------------------
+
+    def solve(self, domain, problem):
+        # Parser
+        parser = PDDL_Parser()
+        parser.parse_domain(domain)
+        parser.parse_problem(problem)
+        # Parsed data
+        state = parser.state
+        goal_pos = parser.positive_goals
+        goal_not = parser.negative_goals
+        # Do nothing
+        if self.applicable(state, goal_pos, goal_not):
+            return []
+        # Grounding process (see ground.py)
+        ground_actions = Grounder(parser).ground_actions()
+        # Bitmask encoding, as in Planner.solve
+        atom_bit = {}
+        def bitmask(atoms):
+            mask = 0
+            for atom in atoms:
+                bit = atom_bit.get(atom)
+                if bit is None:
+                    bit = atom_bit[atom] = 1 << len(atom_bit)
+                mask |= bit
+            return mask
+        init = bitmask(state)
+        masked_actions = []
+        for act in ground_actions:
+            masked_actions.append((bitmask(act.positive_preconditions),
+                                   bitmask(act.negative_preconditions),
+                                   bitmask(act.add_effects),
+                                   bitmask(act.del_effects), act))
+        pos = bitmask(goal_pos)
+        neg = bitmask(goal_not)
+        # Inverted index: which actions can contribute to an open subgoal
+        # (add a required-true atom or delete a required-false one)
+        supported_by = {}
+        for index, masked in enumerate(masked_actions):
+            for atom, bit in atom_bit.items():
+                if masked[2] & bit or masked[3] & bit:
+                    supported_by.setdefault(bit, []).append(index)
+        # Best-first regression over (required-true, required-false) masks
+        def unsatisfied(pos, neg):
+            return (pos & ~init).bit_count() + (neg & init).bit_count()
+        parent = {(pos, neg): None}
+        fringe = [(unsatisfied(pos, neg), 0, (pos, neg))]
+        tick = 1
+        while fringe:
+            _, _, subgoal = heapq.heappop(fringe)
+            pos, neg = subgoal
+            if pos & ~init == 0 and neg & init == 0:
+                plan = []
+                while parent[subgoal] is not None:
+                    subgoal, act = parent[subgoal]
+                    plan.append(act)
+                return plan
+            # Relevant actions: contribute to some open subgoal
+            relevant = set()
+            bits = pos | neg
+            while bits:
+                bit = bits & -bits
+                bits &= bits - 1
+                relevant.update(supported_by.get(bit, []))
+            for index in sorted(relevant):
+                pre_pos, pre_not, add, delete, act = masked_actions[index]
+                # Must help (add a required atom or delete a forbidden one)
+                # without clobbering the rest of the subgoal
+                if not (add & pos or delete & neg):
+                    continue
+                if add & neg or delete & pos:
+                    continue
+                new_pos = (pos & ~add) | pre_pos
+                new_neg = (neg & ~delete) | pre_not
+                if new_pos & new_neg:
+                    continue
+                new_subgoal = (new_pos, new_neg)
+                if new_subgoal not in parent:
+                    parent[new_subgoal] = (subgoal, act)
+                    heapq.heappush(fringe, (unsatisfied(new_pos, new_neg), tick, new_subgoal))
+                    tick += 1
+        return None
+
+
+# -----------------------------------------------
+# Main
+# -----------------------------------------------
+if __name__ == '__main__':
+    import sys, time
+    start_time = time.time()
+    domain = sys.argv[1]
+    problem = sys.argv[2]
+    verbose = len(sys.argv) > 3 and sys.argv[3] == '-v'
+    planner = RegressionPlanner()
+    plan = planner.solve(domain, problem)
+    print('Time: ' + str(time.time() - start_time) + 's')
+    if plan is not None:
+        print('plan:')
+        for act in plan:
+            print(act if verbose else act.name + ' ' + ' '.join(act.parameters))
+    else:
+        sys.exit('No plan was found')